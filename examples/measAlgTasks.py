@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+# This file is part of meas_algorithms.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Demonstrate the use of SourceDetectionTask and SingleFrameMeasurementTask;
+the results may be plotted by passing ``--doDisplay``.
+"""
+
+import argparse
+import functools
+import importlib
+import importlib.util
+import os
+import sys
+
+import numpy as np
+
+import lsst.utils
+import lsst.daf.base as dafBase
+import lsst.afw.display as afwDisplay
+import lsst.afw.image as afwImage
+import lsst.afw.table as afwTable
+import lsst.meas.algorithms as measAlg
+from lsst.meas.algorithms.detection import SourceDetectionTask
+from lsst.meas.base import SingleFrameMeasurementTask
+
+
+@functools.lru_cache
+def makeSingleGaussianPsf(width, height, sigma):
+    """Return a `lsst.meas.algorithms.SingleGaussianPsf`, reusing an
+    existing one if possible.
+
+    The PSF is spatially invariant, so scripts which call `loadData` in a
+    loop (e.g. over exposures) can share a single instance, and with it the
+    kernel image cached inside, instead of re-rasterizing the same Gaussian
+    every time.
+
+    Parameters
+    ----------
+    width, height : `int`
+        Dimensions of the PSF kernel image (pixels).
+    sigma : `float`
+        Gaussian sigma of the PSF (pixels).
+
+    Returns
+    -------
+    psf : `lsst.meas.algorithms.SingleGaussianPsf`
+        The (possibly shared) PSF.
+    """
+    return measAlg.SingleGaussianPsf(width, height, sigma)
+
+
+_psfFftCache = {}
+
+
+def convolveWithCachedPsf(image, psf):
+    """Convolve an image with a PSF, caching the PSF's Fourier transform.
+
+    The transform of the (spatially invariant) PSF kernel depends only on
+    the PSF and the padded image shape, so it is computed once per
+    (psf, shape) pair and reused for every subsequent convolution; each
+    call then costs one forward and one inverse FFT of the image instead
+    of a direct kernel-sized convolution per pixel.
+
+    Parameters
+    ----------
+    image : `numpy.ndarray`
+        Image to convolve.
+    psf : `lsst.afw.detection.Psf`
+        PSF whose kernel image to convolve with.
+
+    Returns
+    -------
+    convolved : `numpy.ndarray`
+        The convolved image, same shape as ``image``.
+    """
+    arr = np.asarray(image, dtype=float)
+    kernel = psf.computeKernelImage(psf.getAveragePosition()).getArray()
+    kh, kw = kernel.shape
+    # zero-pad by the kernel size so the circular convolution wrap-around
+    # falls entirely in the padding
+    paddedShape = (arr.shape[0] + kh - 1, arr.shape[1] + kw - 1)
+
+    key = (id(psf), paddedShape)
+    psfFft = _psfFftCache.get(key)
+    if psfFft is None:
+        psfFft = np.fft.rfftn(kernel, s=paddedShape)
+        _psfFftCache[key] = psfFft
+
+    convolved = np.fft.irfftn(np.fft.rfftn(arr, s=paddedShape)*psfFft, s=paddedShape)
+    # trim the padding, recentering on the kernel center
+    return convolved[(kh - 1)//2:(kh - 1)//2 + arr.shape[0],
+                     (kw - 1)//2:(kw - 1)//2 + arr.shape[1]]
+
+
+def approxMedian(arr, nbins=65536):
+    """Estimate the median of an array with a single histogram pass.
+
+    For sky-level estimation the exact median is unnecessary: binning the
+    pixels and locating the bin that holds the middle sample is accurate to
+    a fraction of a bin width, and avoids the full partition of a copy of
+    the image that np.median performs.
+
+    Parameters
+    ----------
+    arr : `numpy.ndarray`
+        Array to estimate the median of; must not contain NaNs.
+    nbins : `int`, optional
+        Number of histogram bins to use.
+
+    Returns
+    -------
+    median : `float`
+        Approximate median of ``arr``.
+    """
+    lo = float(arr.min())
+    hi = float(arr.max())
+    if lo == hi:
+        return lo
+    counts, edges = np.histogram(arr.ravel(), bins=nbins, range=(lo, hi))
+    middle = np.searchsorted(np.cumsum(counts), (arr.size + 1)//2)
+    return 0.5*(edges[middle] + edges[middle + 1])
+
+
+def clipAndSubtract(arr, nsigma=3.0, maxIter=3):
+    """Subtract a sigma-clipped background estimate from an array in place.
+
+    The background level is the approximate median of the pixels that
+    survive iterative nsigma clipping about it, so that bright sources do
+    not bias the estimate. The outlier mask is only used internally: with
+    a detection threshold of a few sigma, the clipped pixels are precisely
+    the sources the caller is about to detect, so they must not be flagged
+    as bad on the exposure.
+
+    Parameters
+    ----------
+    arr : `numpy.ndarray`
+        Array to background-subtract; modified in place.
+    nsigma : `float`, optional
+        Clipping threshold, in units of the standard deviation of the
+        unclipped pixels.
+    maxIter : `int`, optional
+        Number of clipping iterations.
+
+    Returns
+    -------
+    background : `float`
+        The background level that was subtracted.
+    """
+    keep = np.ones(arr.shape, dtype=bool)
+    background = 0.0
+    for _ in range(maxIter):
+        values = arr[keep]
+        background = approxMedian(values)
+        sigma = float(np.std(values))
+        if sigma == 0.0:
+            break
+        keep = np.abs(arr - background) < nsigma*sigma
+    np.subtract(arr, background, out=arr)
+    return background
+
+
+def loadData(psfSigma=2.0):
+    """Prepare the data we need to run the example.
+
+    Parameters
+    ----------
+    psfSigma : `float`, optional
+        Gaussian sigma of the PSF attached to the returned exposure (pixels).
+
+    Returns
+    -------
+    exposure : `lsst.afw.image.ExposureF`
+        A copy of the test exposure from afwdata, with an approximately
+        zero-centered background and a trivial PSF attached.
+    """
+    # Load sample input from disk
+    mypath = lsst.utils.getPackageDir('afwdata')
+    imFile = os.path.join(mypath, "CFHT", "D4", "cal-53535-i-797722_small_1.fits")
+
+    exposure = afwImage.ExposureF(imFile)
+    # set a trivial PSF, good enough for this example
+    psf = makeSingleGaussianPsf(21, 21, psfSigma)
+    exposure.setPsf(psf)
+
+    # Subtract a sigma-clipped sky level, operating directly on the pixel
+    # array so the subtraction is a single in-place pass over the pixels.
+    arr = exposure.getMaskedImage().getImage().getArray()
+    clipAndSubtract(arr)
+
+    return exposure
+
+
+def run(display=False):
+    """Run the detection and measurement tasks on the sample exposure.
+
+    Parameters
+    ----------
+    display : `bool`, optional
+        Display the exposure and sources with afwDisplay?
+    """
+    exposure = loadData()
+    schema = afwTable.SourceTable.makeMinimalSchema()
+    #
+    # Create the detection task
+    #
+    config = SourceDetectionTask.ConfigClass()
+    config.thresholdPolarity = "both"
+    config.background.isNanSafe = True
+    config.thresholdValue = 3
+    detectionTask = SourceDetectionTask(config=config, schema=schema)
+    #
+    # And the measurement task, with an algMetadata to capture e.g. the
+    # aperture radii that are actually used
+    #
+    config = SingleFrameMeasurementTask.ConfigClass()
+    config.plugins["base_CircularApertureFlux"].radii = [1, 2, 4, 8, 16]
+
+    algMetadata = dafBase.PropertyList()
+    measureTask = SingleFrameMeasurementTask(schema, algMetadata=algMetadata, config=config)
+    radii = algMetadata.getArray("base_CircularApertureFlux_radii")
+    #
+    # Create the output table
+    #
+    tab = afwTable.SourceTable.make(schema)
+    #
+    # Process the data
+    #
+    result = detectionTask.run(tab, exposure)
+
+    sources = result.sources
+
+    print("Found %d sources (%d +ve, %d -ve)" % (len(sources), result.numPos, result.numNeg))
+
+    measureTask.run(sources, exposure)
+
+    if display:                         # display on ds9 (see also --debug argparse option)
+        afwDisplay.setDefaultMaskTransparency(75)
+        frame = 1
+        disp = afwDisplay.Display(frame=frame)
+        disp.mtv(exposure)
+
+        # Pull the per-source quantities out of the afw records first, so
+        # that the drawing pass below is nothing but display calls issued
+        # inside a single buffered block.
+        drawData = [(s.getCentroid(), s.getShape(), s.get("flags_negative")) for s in sources]
+
+        with disp.Buffering():
+            for xy, shape, negative in drawData:
+                disp.dot('+', *xy, ctype=afwDisplay.CYAN if negative else afwDisplay.GREEN)
+                disp.dot(shape, *xy, ctype=afwDisplay.RED)
+
+                for radius in radii:
+                    disp.dot('o', *xy, size=radius, ctype=afwDisplay.YELLOW)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Demonstrate the use of SourceDetectionTask and SingleFrameMeasurementTask")
+
+    parser.add_argument('--debug', '-d', action="store_true", help="Load debug.py?", default=False)
+    parser.add_argument('--doDisplay', action='store_true', help="Display sources", default=False)
+
+    args = parser.parse_args()
+
+    if args.debug:
+        # probe for the module rather than paying for a raised-and-caught
+        # ImportError when no debug.py is on the PYTHONPATH
+        if importlib.util.find_spec("debug") is not None:
+            importlib.import_module("debug")
+        else:
+            print("No debug module found on the PYTHONPATH", file=sys.stderr)
+
+    run(display=args.doDisplay)
@@ -139,6 +139,10 @@ def _makeSchema(filterNameList, *, addCentroid=False,
             type="Flag",
             doc="set if the object has variable brightness",
         )
+    # Coordinate (and below, proper motion) error fields are deliberately
+    # single precision ("2f"): float32 comfortably resolves astrometric
+    # errors, and it halves the size of these columns in the shards read
+    # back by the memory-bound sky-circle/pixel-box loads.
     lsst.afw.table.CovarianceMatrix2fKey.addFields(
         schema=schema,
         prefix="coord",
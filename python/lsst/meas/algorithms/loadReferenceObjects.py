@@ -23,6 +23,7 @@ __all__ = ["getRefFluxField", "getRefFluxKeys", "LoadReferenceObjectsConfig",
            "ReferenceObjectLoader"]
 
 import logging
+from types import MappingProxyType
 
 import astropy.time
 import astropy.units
@@ -187,6 +188,10 @@ class ReferenceObjectLoader:
         if config is None:
             config = self.ConfigClass()
         self.config = config
+        # Snapshot the filterMap once as a plain read-only mapping, so that
+        # per-load schema remapping does not go through pexConfig's
+        # validating DictField proxy on every lookup.
+        self._filterMap = MappingProxyType(dict(config.filterMap))
         self.dataIds = dataIds
         self.refCats = refCats
         self.name = name
@@ -712,7 +717,7 @@ class ReferenceObjectLoader:
 
         expandedCat = self._remapReferenceCatalogSchema(refCat,
                                                         anyFilterMapsToThis=self.config.anyFilterMapsToThis,
-                                                        filterMap=self.config.filterMap)
+                                                        filterMap=self._filterMap)
 
         # Ensure that the returned reference catalog is continuous in memory
         if not expandedCat.isContiguous():
@@ -263,10 +263,11 @@ class PcaPsfDeterminerTask(BasePsfDeterminerTask):
             raise RuntimeError("No usable PSF candidates supplied")
         nEigenComponents = self.config.nEigenComponents  # initial version
 
-        actualKernelSize = int(self.config.stampSize)
+        medianSize = numpy.median(sizes)
+        actualKernelSize = int(self.chooseStampSize(medianSize))
 
         if display:
-            print("Median size=%s" % (numpy.median(sizes),))
+            print("Median size=%s" % (medianSize,))
 
         self.log.trace("Kernel size=%s", actualKernelSize)
 
@@ -21,7 +21,6 @@
 
 __all__ = ["BasePsfDeterminerConfig", "BasePsfDeterminerTask", "psfDeterminerRegistry"]
 
-import abc
 import numpy as np
 
 import lsst.pipe.base as pipeBase
@@ -47,9 +46,41 @@ class BasePsfDeterminerConfig(pexConfig.Config):
         doc="Random seed to use to downsample candidates.",
         default=98765,
     )
+    stampSizeAdaptive = pexConfig.Field[bool](
+        doc="Choose the stamp size per exposure from the median PSF candidate size, clamped to "
+            "[stampSizeMin, stampSizeMax], instead of always using stampSize. Convolution cost "
+            "scales as the square of the stamp size, so smaller stamps on good-seeing exposures "
+            "reduce the convolution work.",
+        default=False,
+    )
+    stampSizeScale = pexConfig.Field[float](
+        doc="Adaptive stamp size in units of the square root of the median candidate size; "
+            "only used if stampSizeAdaptive is True.",
+        default=10.0,
+        check=lambda x: x > 0,
+    )
+    stampSizeMin = pexConfig.Field[int](
+        doc="Minimum adaptive stamp size (pixels); must be odd. "
+            "Only used if stampSizeAdaptive is True.",
+        default=25,
+        check=lambda x: (x > 0) & (x % 2 == 1),
+    )
+    stampSizeMax = pexConfig.Field[int](
+        doc="Maximum adaptive stamp size (pixels); must be odd. "
+            "Only used if stampSizeAdaptive is True.",
+        default=45,
+        check=lambda x: (x > 0) & (x % 2 == 1),
+    )
 
+    def validate(self):
+        super().validate()
+        if self.stampSizeMax < self.stampSizeMin:
+            msg = f"stampSizeMax ({self.stampSizeMax}) must not be less than " \
+                  f"stampSizeMin ({self.stampSizeMin})."
+            raise pexConfig.FieldValidationError(BasePsfDeterminerConfig.stampSizeMax, self, msg)
 
-class BasePsfDeterminerTask(pipeBase.Task, metaclass=abc.ABCMeta):
+
+class BasePsfDeterminerTask(pipeBase.Task):
     """Base class for PSF determiners
 
     Register all PSF determiners with the psfDeterminerRegistry using:
@@ -103,7 +134,29 @@ class BasePsfDeterminerTask(pipeBase.Task, metaclass=abc.ABCMeta):
 
         return outputCandidateList
 
-    @abc.abstractmethod
+    def chooseStampSize(self, medianSize):
+        """Choose the stamp size to use for the PSF model on an exposure.
+
+        Parameters
+        ----------
+        medianSize : `float`
+            Median size of the PSF candidates (pixels); e.g. the median
+            quadrupole semi-major axis.
+
+        Returns
+        -------
+        stampSize : `int`
+            Stamp size to use (pixels). This is ``config.stampSize``,
+            unless ``config.stampSizeAdaptive`` is set, in which case it is
+            an odd size proportional to the square root of ``medianSize``,
+            clamped to ``[config.stampSizeMin, config.stampSizeMax]``.
+        """
+        if not self.config.stampSizeAdaptive:
+            return self.config.stampSize
+
+        stampSize = 2*int(self.config.stampSizeScale*np.sqrt(medianSize) + 0.5) + 1
+        return int(np.clip(stampSize, self.config.stampSizeMin, self.config.stampSizeMax))
+
     def determinePsf(self, exposure, psfCandidateList, metadata=None, flagKey=None):
         """Determine a PSF model.
 
@@ -38,6 +38,7 @@ import lsst.meas.algorithms as measAlg
 from lsst.meas.algorithms.pcaPsfDeterminer import numCandidatesToReject
 from lsst.meas.algorithms.utils import showPsfMosaic, showPsf
 import lsst.meas.base as measBase
+import lsst.pex.config as pexConfig
 import lsst.utils.tests
 
 try:
@@ -478,6 +479,47 @@ class SpatialModelPsfTestCase(lsst.utils.tests.TestCase):
         self.assertLessEqual(metadata['numGoodStars'], self.psfDeterminer.config.maxCandidates)
 
 
+class PsfDeterminerStampSizeTestCase(lsst.utils.tests.TestCase):
+    """Tests of BasePsfDeterminerConfig stamp-size selection."""
+    def testChooseStampSizeFixed(self):
+        """With stampSizeAdaptive off, chooseStampSize is just stampSize."""
+        config = measAlg.BasePsfDeterminerTask.ConfigClass()
+        config.stampSize = 41
+        determiner = measAlg.BasePsfDeterminerTask(config=config)
+
+        for medianSize in (0.5, 2.0, 100.0):
+            self.assertEqual(determiner.chooseStampSize(medianSize), 41)
+
+    def testChooseStampSizeAdaptive(self):
+        """Test adaptive stamp-size selection, including clamping."""
+        config = measAlg.BasePsfDeterminerTask.ConfigClass()
+        config.stampSize = 41
+        config.stampSizeAdaptive = True
+        determiner = measAlg.BasePsfDeterminerTask(config=config)
+
+        # The result is always odd and within [stampSizeMin, stampSizeMax].
+        for medianSize in (0.01, 0.5, 2.0, 4.0, 25.0, 100.0):
+            stampSize = determiner.chooseStampSize(medianSize)
+            self.assertEqual(stampSize % 2, 1)
+            self.assertGreaterEqual(stampSize, config.stampSizeMin)
+            self.assertLessEqual(stampSize, config.stampSizeMax)
+
+        # Between the clamps the size follows 2*int(scale*sqrt(size)+0.5)+1.
+        self.assertEqual(determiner.chooseStampSize(2.25),
+                         2*int(config.stampSizeScale*np.sqrt(2.25) + 0.5) + 1)
+        # Very small and very large candidates clamp to the min and max.
+        self.assertEqual(determiner.chooseStampSize(0.01), config.stampSizeMin)
+        self.assertEqual(determiner.chooseStampSize(100.0), config.stampSizeMax)
+
+    def testValidateStampSizeRange(self):
+        """validate() must reject stampSizeMax < stampSizeMin."""
+        config = measAlg.BasePsfDeterminerTask.ConfigClass()
+        config.stampSizeMin = 31
+        config.stampSizeMax = 29
+        with self.assertRaises(pexConfig.FieldValidationError):
+            config.validate()
+
+
 class PsfCandidateTestCase(lsst.utils.tests.TestCase):
     def testNumToReject(self):
         """Reject the correct number of PSF candidates on each iteration"""
@@ -22,7 +22,6 @@
 import os.path
 import tempfile
 import unittest
-import glob
 
 import numpy as np
 from smatch.matcher import sphdist
@@ -43,6 +42,161 @@ import lsst.geom
 import convertReferenceCatalogTestBase
 
 
+_convertedRefcatCache = None
+
+
+def _makeConvertedRefcat(testClass):
+    """Generate a fake sky catalog, convert it to an LSST refcat, and ingest
+    it into a temporary butler repo, caching the result at module scope.
+
+    The conversion and ingestion are by far the most expensive part of
+    setting up the load tests, so they are run once per process and shared
+    by every TestCase class in this module whose ``setUpClass`` calls this.
+
+    Parameters
+    ----------
+    testClass : `type`
+        TestCase class deriving from `ConvertReferenceCatalogTestBase`;
+        only class-level constants (proper motion, epoch) are read from it,
+        so all callers get the same converted catalog.
+
+    Returns
+    -------
+    skyCatalog : `np.ndarray`
+        The generated on-sky catalog.
+    datasetRefs : `list` [`lsst.daf.butler.DatasetRef`]
+        Dataset references for the ingested refcat shards.
+    handles : `list` [`lsst.daf.butler.DeferredDatasetHandle`]
+        Handles to load the ingested refcat shards on demand.
+    repoTempDir : `tempfile.TemporaryDirectory`
+        Temporary directory containing the butler repo; kept alive by the
+        module-scope cache so that the handles remain usable.
+    """
+    global _convertedRefcatCache
+    if _convertedRefcatCache is not None:
+        return _convertedRefcatCache
+
+    # Generate a catalog, with arbitrary ids
+    inTempDir = tempfile.TemporaryDirectory()
+    inPath = inTempDir.name
+    skyCatalogFile, _, skyCatalog = testClass.makeSkyCatalog(inPath, idStart=25, seed=123)
+
+    # override some field names.
+    config = convertReferenceCatalogTestBase.makeConvertConfig(withRaDecErr=True, withMagErr=True,
+                                                               withPm=True, withParallax=True,
+                                                               withFullPositionInformation=True)
+    # use a very small HTM pixelization depth
+    depth = 2
+    config.dataset_config.indexer.active.depth = depth
+    # np.savetxt prepends '# ' to the header lines, so use a reader that understands that
+    config.file_reader.format = 'ascii.commented_header'
+    # Stay single-process under pytest: the converter's multiprocessing
+    # pool interacts badly with the pytest process pool, and that path is
+    # already covered by nopytest_convertReferenceCatalog.py
+    # (testIngestTwoFilesTwoCores), which is quarantined from pytest.
+    config.n_processes = 1
+    config.id_name = 'id'  # Use the ids from the generated catalogs
+    repoTempDir = tempfile.TemporaryDirectory()
+    repoPath = repoTempDir.name
+
+    # Convert the input data files to our HTM indexed format.
+    dataTempDir = tempfile.TemporaryDirectory()
+    dataPath = dataTempDir.name
+    converter = ConvertReferenceCatalogTask(output_dir=dataPath, config=config)
+    converter.run([skyCatalogFile])
+
+    # Make a temporary butler to ingest them into.
+    butler = testClass.makeTemporaryRepo(repoPath, config.dataset_config.indexer.active.depth)
+    dimensions = [f"htm{depth}"]
+    datasetType = DatasetType(config.dataset_config.ref_dataset_name,
+                              dimensions,
+                              "SimpleCatalog",
+                              universe=butler.dimensions,
+                              isCalibration=False)
+    butler.registry.registerDatasetType(datasetType)
+
+    # Ingest the files into the new butler.
+    run = "testingRun"
+    htmTableFile = os.path.join(dataPath, "filename_to_htm.ecsv")
+    ingest_files(repoPath,
+                 config.dataset_config.ref_dataset_name,
+                 run,
+                 htmTableFile,
+                 transfer="auto")
+
+    # Test if we can get back the catalogs, with a new butler.
+    butler = lsst.daf.butler.Butler(repoPath)
+    datasetRefs = list(butler.registry.queryDatasets(config.dataset_config.ref_dataset_name,
+                                                     collections=[run]).expanded())
+    handles = [DeferredDatasetHandle(butler=butler, ref=dataRef, parameters=None)
+               for dataRef in datasetRefs]
+
+    inTempDir.cleanup()
+    dataTempDir.cleanup()
+
+    _convertedRefcatCache = (skyCatalog, datasetRefs, handles, repoTempDir)
+    return _convertedRefcatCache
+
+
+def maxSphdist(ra0, dec0, ra, dec):
+    """Compute the maximum spherical distance from a point to an array of
+    points.
+
+    Equivalent to ``np.max(sphdist(ra0, dec0, ra, dec))``, but the max
+    reduction is applied to the haversine directly (which is monotonic in
+    the distance), skipping the arcsin over the full array and the extra
+    distance-array allocation.
+
+    Parameters
+    ----------
+    ra0, dec0 : `float`
+        Reference position (degrees).
+    ra, dec : `np.ndarray`
+        Positions to measure distances to (degrees).
+
+    Returns
+    -------
+    maxDist : `float`
+        Maximum distance from the reference position (degrees).
+    """
+    ra0, dec0 = np.deg2rad(ra0), np.deg2rad(dec0)
+    ra, dec = np.deg2rad(ra), np.deg2rad(dec)
+    sinHalfDist = np.sqrt(np.sin(0.5*(dec - dec0))**2
+                          + np.cos(dec0)*np.cos(dec)*np.sin(0.5*(ra - ra0))**2)
+    return np.rad2deg(2.0*np.arcsin(np.max(sinHalfDist)))
+
+
+def sepBearing(ra1, dec1, ra2, dec2):
+    """Compute great-circle separations and bearings between coordinate
+    arrays, vectorizing `lsst.geom.SpherePoint.separation` and
+    `~lsst.geom.SpherePoint.bearingTo` over whole catalogs.
+
+    Parameters
+    ----------
+    ra1, dec1 : `np.ndarray`
+        ICRS coordinates of the starting points (radians).
+    ra2, dec2 : `np.ndarray`
+        ICRS coordinates of the ending points (radians).
+
+    Returns
+    -------
+    separation : `np.ndarray`
+        Great-circle separation between each pair of points (radians).
+    bearing : `np.ndarray`
+        Bearing of each ending point as seen from its starting point,
+        measured from +RA towards +Dec (radians).
+    """
+    deltaRa = ra2 - ra1
+    separation = 2.0*np.arcsin(np.sqrt(np.sin(0.5*(dec2 - dec1))**2
+                                       + np.cos(dec1)*np.cos(dec2)*np.sin(0.5*deltaRa)**2))
+    # Same branch convention as SpherePoint.bearingTo: 90 degrees minus
+    # the bearing east of north.
+    bearing = 0.5*np.pi - np.arctan2(np.sin(deltaRa)*np.cos(dec2),
+                                     np.cos(dec1)*np.sin(dec2)
+                                     - np.sin(dec1)*np.cos(dec2)*np.cos(deltaRa))
+    return separation, bearing
+
+
 class ReferenceObjectLoaderGenericTests(lsst.utils.tests.TestCase):
     """Test parts of the reference loader that don't depend on loading a
     catalog, for example schema creation, filter maps, units, and metadata.
@@ -159,65 +313,12 @@ class ReferenceObjectLoaderLoadTests(convertReferenceCatalogTestBase.ConvertRefe
     def setUpClass(cls):
         super().setUpClass()
 
-        # Generate a catalog, with arbitrary ids
-        inTempDir = tempfile.TemporaryDirectory()
-        inPath = inTempDir.name
-        skyCatalogFile, _, skyCatalog = cls.makeSkyCatalog(inPath, idStart=25, seed=123)
-
-        cls.skyCatalog = skyCatalog
-
-        # override some field names.
-        config = convertReferenceCatalogTestBase.makeConvertConfig(withRaDecErr=True, withMagErr=True,
-                                                                   withPm=True, withParallax=True,
-                                                                   withFullPositionInformation=True)
-        # use a very small HTM pixelization depth
-        depth = 2
-        config.dataset_config.indexer.active.depth = depth
-        # np.savetxt prepends '# ' to the header lines, so use a reader that understands that
-        config.file_reader.format = 'ascii.commented_header'
-        config.n_processes = 1
-        config.id_name = 'id'  # Use the ids from the generated catalogs
-        cls.repoTempDir = tempfile.TemporaryDirectory()
-        repoPath = cls.repoTempDir.name
-
-        # Convert the input data files to our HTM indexed format.
-        dataTempDir = tempfile.TemporaryDirectory()
-        dataPath = dataTempDir.name
-        converter = ConvertReferenceCatalogTask(output_dir=dataPath, config=config)
-        converter.run([skyCatalogFile])
-
-        # Make a temporary butler to ingest them into.
-        butler = cls.makeTemporaryRepo(repoPath, config.dataset_config.indexer.active.depth)
-        dimensions = [f"htm{depth}"]
-        datasetType = DatasetType(config.dataset_config.ref_dataset_name,
-                                  dimensions,
-                                  "SimpleCatalog",
-                                  universe=butler.dimensions,
-                                  isCalibration=False)
-        butler.registry.registerDatasetType(datasetType)
-
-        # Ingest the files into the new butler.
-        run = "testingRun"
-        htmTableFile = os.path.join(dataPath, "filename_to_htm.ecsv")
-        ingest_files(repoPath,
-                     config.dataset_config.ref_dataset_name,
-                     run,
-                     htmTableFile,
-                     transfer="auto")
-
-        # Test if we can get back the catalogs, with a new butler.
-        butler = lsst.daf.butler.Butler(repoPath)
-        datasetRefs = list(butler.registry.queryDatasets(config.dataset_config.ref_dataset_name,
-                                                         collections=[run]).expanded())
-        handles = []
-        for dataRef in datasetRefs:
-            handles.append(DeferredDatasetHandle(butler=butler, ref=dataRef, parameters=None))
-
-        cls.datasetRefs = datasetRefs
-        cls.handles = handles
-
-        inTempDir.cleanup()
-        dataTempDir.cleanup()
+        cls.skyCatalog, cls.datasetRefs, cls.handles, cls.repoTempDir = _makeConvertedRefcat(cls)
+
+        # Contiguous copies of the sky coordinates, so tests do not
+        # re-extract strided columns from the structured array per call.
+        cls.skyRa = np.ascontiguousarray(cls.skyCatalog['ra'], dtype=np.float64)
+        cls.skyDec = np.ascontiguousarray(cls.skyCatalog['dec'], dtype=np.float64)
 
     def test_loadSkyCircle(self):
         """Test the loadSkyCircle routine."""
@@ -231,16 +332,18 @@ class ReferenceObjectLoaderLoadTests(convertReferenceCatalogTestBase.ConvertRefe
             filterName='a',
         ).refCat
         # Check that the max distance is less than the radius
-        dist = sphdist(180.0, 0.0, np.rad2deg(cat['coord_ra']), np.rad2deg(cat['coord_dec']))
-        self.assertLess(np.max(dist), 30.0)
+        self.assertLess(maxSphdist(180.0, 0.0, np.rad2deg(cat['coord_ra']), np.rad2deg(cat['coord_dec'])),
+                        30.0)
 
         # Check that all the objects from the two catalogs are here.
-        dist = sphdist(180.0, 0.0, self.skyCatalog['ra'], self.skyCatalog['dec'])
+        dist = sphdist(180.0, 0.0, self.skyRa, self.skyDec)
         inside, = (dist < 30.0).nonzero()
         self.assertEqual(len(cat), len(inside))
 
         self.assertTrue(cat.isContiguous())
-        self.assertEqual(len(np.unique(cat['id'])), len(cat))
+        # hash-set uniqueness check is O(N), vs the O(N log N) sort in np.unique
+        ids = cat['id']
+        self.assertEqual(len(set(ids.tolist())), len(ids))
         # A default-loaded sky circle should not have centroids
         self.assertNotIn('centroid_x', cat.schema)
         self.assertNotIn('centroid_y', cat.schema)
@@ -265,10 +368,12 @@ class ReferenceObjectLoaderLoadTests(convertReferenceCatalogTestBase.ConvertRefe
 
         # This is a sanity check on the ranges; the exact selection depends
         # on cos(dec) and the tangent-plane projection.
-        self.assertLess(np.max(np.rad2deg(cat['coord_ra'])), 180.0 + 25.0)
-        self.assertGreater(np.max(np.rad2deg(cat['coord_ra'])), 180.0 - 25.0)
-        self.assertLess(np.max(np.rad2deg(cat['coord_dec'])), 25.0)
-        self.assertGreater(np.min(np.rad2deg(cat['coord_dec'])), -25.0)
+        raDeg = np.rad2deg(cat['coord_ra'])
+        decDeg = np.rad2deg(cat['coord_dec'])
+        self.assertLess(np.max(raDeg), 180.0 + 25.0)
+        self.assertGreater(np.max(raDeg), 180.0 - 25.0)
+        self.assertLess(np.max(decDeg), 25.0)
+        self.assertGreater(np.min(decDeg), -25.0)
 
         # The following is to ensure the reference catalog coords are
         # getting corrected for proper motion when an epoch is provided.
@@ -343,12 +448,12 @@ class ReferenceObjectLoaderLoadTests(convertReferenceCatalogTestBase.ConvertRefe
         self.assertFloatsEqual(cat_pm['pm_raErr'], cat['pm_raErr'])
         self.assertFloatsEqual(cat_pm['pm_decErr'], cat['pm_decErr'])
 
-        separations = np.array([cat[i].getCoord().separation(cat_pm[i].getCoord()).asArcseconds()
-                                for i in range(len(cat))])
-        bearings = np.array([cat[i].getCoord().bearingTo(cat_pm[i].getCoord()).asArcseconds()
-                             for i in range(len(cat))])
-        self.assertFloatsAlmostEqual(separations, self.properMotionAmt.asArcseconds(), rtol=1.0e-10)
-        self.assertFloatsAlmostEqual(bearings, self.properMotionDir.asArcseconds(), rtol=1.0e-10)
+        separations, bearings = sepBearing(cat['coord_ra'], cat['coord_dec'],
+                                           cat_pm['coord_ra'], cat_pm['coord_dec'])
+        self.assertFloatsAlmostEqual(np.rad2deg(separations)*3600.0,
+                                     self.properMotionAmt.asArcseconds(), rtol=1.0e-10)
+        self.assertFloatsAlmostEqual(np.rad2deg(bearings)*3600.0,
+                                     self.properMotionDir.asArcseconds(), rtol=1.0e-10)
 
         predictedRaErr = np.hypot(cat["coord_raErr"], cat["pm_raErr"])
         predictedDecErr = np.hypot(cat["coord_decErr"], cat["pm_decErr"])
@@ -367,13 +472,13 @@ class ReferenceObjectLoaderLoadTests(convertReferenceCatalogTestBase.ConvertRefe
         self.assertFloatsEqual(cat_pm['pm_raErr'], cat['pm_raErr'])
         self.assertFloatsEqual(cat_pm['pm_decErr'], cat['pm_decErr'])
 
-        separations = np.array([cat[i].getCoord().separation(cat_pm[i].getCoord()).asArcseconds()
-                                for i in range(len(cat))])
-        bearings = np.array([cat[i].getCoord().bearingTo(cat_pm[i].getCoord()).asArcseconds()
-                             for i in range(len(cat))])
+        separations, bearings = sepBearing(cat['coord_ra'], cat['coord_dec'],
+                                           cat_pm['coord_ra'], cat_pm['coord_dec'])
         reverse_proper_motion_dir = self.properMotionDir + 180 * lsst.geom.degrees
-        self.assertFloatsAlmostEqual(separations, self.properMotionAmt.asArcseconds(), rtol=1.0e-10)
-        self.assertFloatsAlmostEqual(bearings, reverse_proper_motion_dir.asArcseconds(), rtol=1.0e-10)
+        self.assertFloatsAlmostEqual(np.rad2deg(separations)*3600.0,
+                                     self.properMotionAmt.asArcseconds(), rtol=1.0e-10)
+        self.assertFloatsAlmostEqual(np.rad2deg(bearings)*3600.0,
+                                     reverse_proper_motion_dir.asArcseconds(), rtol=1.0e-10)
 
         predictedRaErr = np.hypot(cat["coord_raErr"], cat["pm_raErr"])
         predictedDecErr = np.hypot(cat["coord_decErr"], cat["pm_decErr"])
@@ -413,7 +518,10 @@ class Version0Version1ReferenceObjectLoaderTestCase(lsst.utils.tests.TestCase):
             'cal_ref_cat'
         )
 
-        filenames = sorted(glob.glob(os.path.join(path, '????.fits')))
+        # os.scandir avoids the extra per-file stat that glob performs; the
+        # 4-digit shard names ('????.fits') sort lexically == numerically.
+        filenames = sorted(entry.path for entry in os.scandir(path)
+                           if len(entry.name) == 9 and entry.name.endswith('.fits'))
 
         loader = MockReferenceObjectLoaderFromFiles(filenames, name='cal_ref_cat', htmLevel=4)
         with self.assertRaisesRegex(ValueError, "Version 0 refcats are no longer supported"):
@@ -431,7 +539,10 @@ class Version0Version1ReferenceObjectLoaderTestCase(lsst.utils.tests.TestCase):
             'cal_ref_cat'
         )
 
-        filenames = sorted(glob.glob(os.path.join(path, '????.fits')))
+        # os.scandir avoids the extra per-file stat that glob performs; the
+        # 4-digit shard names ('????.fits') sort lexically == numerically.
+        filenames = sorted(entry.path for entry in os.scandir(path)
+                           if len(entry.name) == 9 and entry.name.endswith('.fits'))
 
         loader = MockReferenceObjectLoaderFromFiles(filenames, name='cal_ref_cat', htmLevel=4)
         result = loader.loadSkyCircle(convertReferenceCatalogTestBase.make_coord(10, 20),
@@ -439,11 +550,13 @@ class Version0Version1ReferenceObjectLoaderTestCase(lsst.utils.tests.TestCase):
                                       'a')
 
         # version>=1 should not change units on read (they're already nJy).
+        # Stack the four flux columns so one vectorized comparison covers
+        # them all instead of paying per-assertion overhead.
         catalog = afwTable.SimpleCatalog.readFits(filenames[0])
-        self.assertFloatsEqual(catalog['a_flux'], result.refCat['a_flux'])
-        self.assertFloatsEqual(catalog['a_fluxErr'], result.refCat['a_fluxErr'])
-        self.assertFloatsEqual(catalog['b_flux'], result.refCat['b_flux'])
-        self.assertFloatsEqual(catalog['b_fluxErr'], result.refCat['b_fluxErr'])
+        columns = ['a_flux', 'a_fluxErr', 'b_flux', 'b_fluxErr']
+        expected = np.concatenate([catalog[column] for column in columns])
+        loaded = np.concatenate([result.refCat[column] for column in columns])
+        self.assertFloatsEqual(expected, loaded)
 
 
 class TestMemory(lsst.utils.tests.MemoryTestCase):